@@ -1,36 +1,226 @@
 """To view the github user activity via CLI."""
 
-import urllib.request
 import json
 import sys
+import time
 
+from collections.abc import Mapping
 from pathlib import Path
 from datetime import datetime, timezone
+from itertools import islice
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 from urllib.error import HTTPError, URLError
 import os
-import getpass
 import logging
 
+if TYPE_CHECKING:
+    # Only for annotations; http.client is imported where requests are made.
+    import http.client
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # -------------------------------------
 #   Configuration constants
 # -------------------------------------
 
+GITHUB_API_HOST = "api.github.com"
 TIMEOUT_SECONDS = 10
+MAX_REDIRECTS = 5
 CACHE_TTL_SECONDS = 900
-MIN_CLI_ARGS_COUNT = 3
-CLI_ARGS_COUNT_WITH_FILTER = 4
+CACHE_DIR_NAME = "gh-activity"
 OUTPUT_SEPARATOR_WIDTH = 40
+OUTPUT_SEPARATOR = "-" * OUTPUT_SEPARATOR_WIDTH
 GITHUB_DEFAULT_EVENTS_PER_PAGE = 30
 
+# Shared read-only default for missing nested objects in event data.
+_EMPTY_DICT = MappingProxyType({})
+
+# Placeholders shown for event fields that are missing from the API data.
+_UNKNOWN_REPOSITORY = "unknown_repository"
+_UNKNOWN_REF = "unknown_ref"
+_UNKNOWN_REF_TYPE = "unknown_ref_type"
+_UNKNOWN_USER = "unknown_user"
+_UNKNOWN_ACTION = "performed an action"
+
+# IssuesEvent actions, grouped by the message they are reported with.
+ISSUE_STATE_ACTIONS = frozenset(
+    {
+        "opened",
+        "edited",
+        "deleted",
+        "closed",
+        "reopened",
+        "transferred",
+        "pinned",
+        "unpinned",
+        "locked",
+        "unlocked",
+    }
+)
+ISSUE_LABEL_ACTIONS = frozenset({"labeled", "unlabeled"})
+
+# Event fields read by GitHubEventHandler, as "/"-separated key paths.
+# Everything else in the API payload is dropped right after parsing.
+EVENT_FIELDS = (
+    "type",
+    "repo/name",
+    "actor/login",
+    "payload/ref",
+    "payload/ref_type",
+    "payload/action",
+    "payload/number",
+    "payload/forkee/full_name",
+    "payload/issue/number",
+    "payload/issue/assignee/login",
+    "payload/issue/labels",
+    "payload/pull_request/title",
+    "payload/pull_request/user/login",
+)
+
+# -------------------------------------
+#   JSON helpers
+# -------------------------------------
+
+
+def _json_loads(data: bytes):
+    """Decode JSON bytes, using orjson when it is installed.
+
+    Args:
+        data (bytes): UTF-8 encoded JSON document.
+
+    Returns:
+        Decoded JSON value.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data) -> bytes:
+    """Encode a value as compact JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: JSON serializable value.
+
+    Returns:
+        bytes: UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _project_event(event: dict) -> dict:
+    """Copy only the EVENT_FIELDS paths of an event into a new dict.
+
+    Args:
+        event (dict): Raw event data from the GitHub API.
+
+    Returns:
+        dict: Event data restricted to the fields used for display.
+    """
+    projected: dict = {}
+    for path in EVENT_FIELDS:
+        *parents, leaf = path.split("/")
+        source, target = event, projected
+        for key in parents:
+            source = source.get(key)
+            if not isinstance(source, dict):
+                break
+            target = target.setdefault(key, {})
+        else:
+            if leaf in source:
+                target[leaf] = source[leaf]
+    return projected
+
+
+def _intern_event_fields(events: list):
+    """Intern the event type and action strings of events in place.
+
+    These values come from a small vocabulary and are compared against the
+    handler table and the requested event type, so interned copies turn
+    those comparisons into identity checks.
+
+    Args:
+        events (list): Event data, as returned by the API or the cache.
+    """
+    for event in events:
+        event_type = event.get("type")
+        if isinstance(event_type, str):
+            event["type"] = sys.intern(event_type)
+        payload = event.get("payload")
+        if isinstance(payload, dict) and isinstance(payload.get("action"), str):
+            payload["action"] = sys.intern(payload["action"])
+
+
+def _read_body(response: "http.client.HTTPResponse") -> bytes | bytearray:
+    """Read a response body, into a preallocated buffer when its size is known.
+
+    Args:
+        response (http.client.HTTPResponse): Response to read.
+
+    Returns:
+        bytes | bytearray: Response body.
+
+    Raises:
+        http.client.IncompleteRead: If the connection closes early.
+    """
+    import http.client
+
+    if not response.length:
+        return response.read()
+
+    body = bytearray(response.length)
+    received = 0
+    with memoryview(body) as view:
+        while received < len(body):
+            count = response.readinto(view[received:])
+            if not count:
+                raise http.client.IncompleteRead(
+                    bytes(body[:received]), len(body) - received
+                )
+            received += count
+    return body
+
+
+def _format_timestamp(epoch: float) -> str:
+    """Format an epoch timestamp as an ISO 8601 UTC string.
+
+    Args:
+        epoch (float): Seconds since the epoch.
+
+    Returns:
+        str: Timestamp such as "2024-01-31T12:00:00Z".
+    """
+    return (
+        datetime.fromtimestamp(epoch, timezone.utc)
+        .isoformat(timespec="seconds")
+        .replace("+00:00", "Z")
+    )
+
 
 class GitHubAPIClient:
     """Class to fetch and display GitHub user activity."""
 
     def __init__(self, user: str):
         self.username = user
-        self.headers = {"User-Agent": "github-user-activity-cli"}
+        # Read-only, so requests that need extra headers build their own dict.
+        self.headers = MappingProxyType(
+            {
+                "User-Agent": "github-user-activity-cli",
+                "Accept": "application/vnd.github+json",
+                "Accept-Encoding": "gzip",
+            }
+        )
         self.timeout = TIMEOUT_SECONDS
-        self.timestamp: str | None = None
+        self.fetched_at: float | None = None
+        self.etag: str | None = None
+        self.cached_events: list | None = None
+        self._connection: "http.client.HTTPSConnection | None" = None
 
     def _get_github_token(self) -> str | None:
         """Get github token.
@@ -41,6 +231,8 @@ class GitHubAPIClient:
 
         token = os.getenv("GITHUB_TOKEN")
         if not token:
+            import getpass
+
             try:
                 token = getpass.getpass("Enter GitHub token: ")
             except (KeyboardInterrupt, EOFError):
@@ -51,26 +243,122 @@ class GitHubAPIClient:
                 return None
         return token
 
-    def _make_request(self, headers: dict) -> list:
+    def _get_connection(self) -> "http.client.HTTPSConnection":
+        """Get the connection to the GitHub API, creating it on first use.
+
+        The connection is kept alive between requests, so the token retry
+        reuses the TCP/TLS session of the first request. When an HTTPS proxy
+        is configured (https_proxy / HTTPS_PROXY, honouring no_proxy), the
+        connection is tunnelled through it as urllib would do.
+
+        Returns:
+            http.client.HTTPSConnection: Connection to the GitHub API.
+        """
+        if self._connection is None:
+            import http.client
+            import urllib.request
+            from base64 import b64encode
+            from urllib.parse import unquote, urlsplit
+
+            proxy = urllib.request.getproxies().get("https")
+            if proxy and not urllib.request.proxy_bypass(GITHUB_API_HOST):
+                if "://" not in proxy:
+                    proxy = f"http://{proxy}"
+                proxy_url = urlsplit(proxy)
+                tunnel_headers = {}
+                if proxy_url.username:
+                    credentials = (
+                        f"{unquote(proxy_url.username)}:"
+                        f"{unquote(proxy_url.password or '')}"
+                    )
+                    tunnel_headers["Proxy-Authorization"] = (
+                        f"Basic {b64encode(credentials.encode()).decode('ascii')}"
+                    )
+                self._connection = http.client.HTTPSConnection(
+                    proxy_url.hostname, proxy_url.port, timeout=self.timeout
+                )
+                self._connection.set_tunnel(GITHUB_API_HOST, headers=tunnel_headers)
+            else:
+                self._connection = http.client.HTTPSConnection(
+                    GITHUB_API_HOST, timeout=self.timeout
+                )
+        return self._connection
+
+    def close(self):
+        """Close the connection to the GitHub API, if any."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _make_request(self, headers: Mapping[str, str]) -> list:
         """Request github url without token.
 
+        Redirects to other paths on the GitHub API (e.g. for a renamed user)
+        are followed, up to MAX_REDIRECTS; redirects to other hosts are not,
+        so the token is never sent elsewhere.
+
         Args:
-            headers (dict) : headers to be sent with request.
+            headers (Mapping[str, str]) : headers to be sent with request.
 
         Returns:
             list : List of repositories event raw data.
+
+        Raises:
+            HTTPError: If GitHub responds with a non-200 status.
+            URLError: If the request could not be completed.
         """
-        github_api_url = f"https://api.github.com/users/{self.username}/events"
+        import gzip
+        import http.client
+        from urllib.parse import urlsplit
 
-        request = urllib.request.Request(github_api_url, headers=headers)
+        github_api_path = f"/users/{self.username}/events"
+        connection = self._get_connection()
 
-        with urllib.request.urlopen(request, timeout=self.timeout) as response:
-            repos_data = json.loads(response.read().decode("utf-8"))
+        if self.etag and self.cached_events:
+            headers = {**headers, "If-None-Match": self.etag}
+
+        for _ in range(MAX_REDIRECTS + 1):
+            try:
+                connection.request("GET", github_api_path, headers=headers)
+                response = connection.getresponse()
+                body = _read_body(response)
+            except (OSError, http.client.HTTPException) as error:
+                connection.close()
+                raise URLError(error) from error
+
+            location = response.getheader("Location")
+            if response.status not in (301, 302, 303, 307, 308) or not location:
+                break
+            redirect_url = urlsplit(location)
+            if redirect_url.netloc not in ("", GITHUB_API_HOST):
+                break
+            github_api_path = redirect_url.path
+            if redirect_url.query:
+                github_api_path += f"?{redirect_url.query}"
+
+        if response.status == 304:
+            # Events unchanged since the cached copy, nothing to parse.
+            repos_data = self.cached_events
+        elif response.status == 200:
+            if response.getheader("Content-Encoding") == "gzip":
+                body = gzip.decompress(body)
+
+            repos_data = [_project_event(event) for event in _json_loads(body)]
+            _intern_event_fields(repos_data)
+            self.etag = response.getheader("ETag")
+        else:
+            raise HTTPError(
+                f"https://{GITHUB_API_HOST}{github_api_path}",
+                response.status,
+                response.reason,
+                response.headers,
+                None,
+            )
 
         if not repos_data:
             logging.warning("No activity found for user '%s'.", self.username)
 
-        self.timestamp = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+        self.fetched_at = time.time()
 
         return repos_data
 
@@ -85,44 +373,53 @@ class GitHubAPIClient:
             if not token:
                 return []
 
-            headers = self.headers.copy()
-            headers["Authorization"] = f"Bearer {token}"
+            headers = {**self.headers, "Authorization": f"Bearer {token}"}
 
             return self._make_request(headers)
         except HTTPError as auth_error:
             logging.warning("Authentication failed or access denied: %s", auth_error)
             return None
 
-    def fetch_activity(self) -> list | None:
+    def fetch_activity(
+        self, cached_events: list | None = None, etag: str | None = None
+    ) -> list | None:
         """Fetch user activity from GitHub API.
 
+        When cached events and their ETag are given, the request is made
+        conditional and the cached events are returned if GitHub reports
+        them as not modified.
+
         Args:
-            None
+            cached_events (list | None): Previously fetched events.
+            etag (str | None): ETag of the previously fetched events.
 
         Returns:
             list: List of repositories event raw data.
         """
+        self.cached_events = cached_events
+        self.etag = etag
         try:
             return self._make_request(self.headers)
         except HTTPError as http_error:
-            if http_error.code == 401:
-                return self._retry_request_with_token()
-
-            if http_error.code == 403:
-                logging.warning(
-                    "Access forbidden or rate limit may have been exceeded. "
-                    "Try again with a token or wait and retry."
-                )
-                # Optionally, retry for access issue
-                return self._retry_request_with_token()
-
-            if http_error.code == 404:
-                logging.warning(
-                    "User '%s' not found on GitHub or Access denied.", self.username
-                )
-                return None
-            logging.warning("HTTP Error: %d", http_error.code)
-            return None
+            match http_error.code:
+                case 401:
+                    return self._retry_request_with_token()
+                case 403:
+                    logging.warning(
+                        "Access forbidden or rate limit may have been exceeded. "
+                        "Try again with a token or wait and retry."
+                    )
+                    # Optionally, retry for access issue
+                    return self._retry_request_with_token()
+                case 404:
+                    logging.warning(
+                        "User '%s' not found on GitHub or Access denied.",
+                        self.username,
+                    )
+                    return None
+                case code:
+                    logging.warning("HTTP Error: %d", code)
+                    return None
         except URLError as url_error:
             logging.warning("URL Error: %s", url_error.reason)
             return None
@@ -131,25 +428,28 @@ class GitHubAPIClient:
             return None
 
 
+def _strip_ref(ref: str) -> tuple[str, str]:
+    """Split a git ref into its kind and short name.
+
+    Args:
+        ref (str): Ref such as "refs/heads/main", or an already short name.
+
+    Returns:
+        tuple[str, str]: ("branch" or "tag", short name), or ("", ref) if the
+            ref has no known prefix.
+    """
+    if ref.startswith("refs/heads/"):
+        return "branch", ref[11:]
+    if ref.startswith("refs/tags/"):
+        return "tag", ref[10:]
+    return "", ref
+
+
 class GitHubEventHandler:
     """Class to formats different GitHub event types outputs."""
 
-    HANDLERS = {
-        "CreateEvent": "_handle_create_event",
-        "PushEvent": "_handle_push_event",
-        "DeleteEvent": "_handle_delete_event",
-        "ForkEvent": "_handle_fork_event",
-        "WatchEvent": "_handle_watch_event",
-        "IssuesEvent": "_handle_issues_event",
-        "PullRequestEvent": "_handle_pull_request_event",
-    }
-
     @staticmethod
-    def get_supported_events():
-        """Get supported event types."""
-        return set(GitHubEventHandler.HANDLERS.keys())
-
-    def _handle_create_event(self, event: dict) -> str:
+    def _handle_create_event(event: dict) -> str:
         """Handle CreateEvent type.
 
         Args:
@@ -158,10 +458,10 @@ class GitHubEventHandler:
         Returns:
             str: Formatted string for CreateEvent.
         """
-        repo_name = event.get("repo", {}).get("name", "unknown_repository")
-        payload = event.get("payload", {})
-        ref = payload.get("ref", "unknown_ref")
-        ref_type = event.get("payload", {}).get("ref_type", "unknown_ref_type")
+        repo_name = (event.get("repo") or _EMPTY_DICT).get("name", _UNKNOWN_REPOSITORY)
+        payload = event.get("payload") or _EMPTY_DICT
+        ref = payload.get("ref") or _UNKNOWN_REF
+        ref_type = payload.get("ref_type", _UNKNOWN_REF_TYPE)
 
         if ref_type == "repository":
             return f"Created a new repository '{repo_name}'"
@@ -171,7 +471,8 @@ class GitHubEventHandler:
             return f"Created a new branch '{ref}' in '{repo_name}'"
         return f"Created a new '{ref}' in '{repo_name}'"
 
-    def _handle_push_event(self, event: dict) -> str:
+    @staticmethod
+    def _handle_push_event(event: dict) -> str:
         """Handle PushEvent type.
 
         Args:
@@ -180,18 +481,15 @@ class GitHubEventHandler:
         Returns:
             str: Formatted string for PushEvent.
         """
-        repo_name = event.get("repo", {}).get("name", "unknown_repository")
-        payload = event.get("payload", {})
-        ref = payload.get("ref", "unknown_ref")
-        if ref.startswith("refs/heads/"):
-            branch = ref.replace("refs/heads/", "")
-            return f"Pushed commit(s) to branch '{branch}' of '{repo_name}'"
-        if ref.startswith("refs/tags/"):
-            tag = ref.replace("refs/tags/", "")
-            return f"Pushed commit(s) to tag '{tag}' of '{repo_name}'"
+        repo_name = (event.get("repo") or _EMPTY_DICT).get("name", _UNKNOWN_REPOSITORY)
+        ref = (event.get("payload") or _EMPTY_DICT).get("ref") or _UNKNOWN_REF
+        ref_kind, ref = _strip_ref(ref)
+        if ref_kind:
+            return f"Pushed commit(s) to {ref_kind} '{ref}' of '{repo_name}'"
         return f"Pushed commit(s) to '{ref}' of '{repo_name}'"
 
-    def _handle_delete_event(self, event: dict) -> str:
+    @staticmethod
+    def _handle_delete_event(event: dict) -> str:
         """Handle DeleteEvent type.
 
         Args:
@@ -200,17 +498,14 @@ class GitHubEventHandler:
         Returns:
             str: Formatted string for DeleteEvent.
         """
-        repo_name = event.get("repo", {}).get("name", "unknown_repository")
-        payload = event.get("payload", {})
-        ref = (
-            payload.get("ref", "unknown_ref")
-            .removeprefix("refs/heads/")
-            .removeprefix("refs/tags/")
-        )
-        ref_type = payload.get("ref_type", "unknown_ref_type")
+        repo_name = (event.get("repo") or _EMPTY_DICT).get("name", _UNKNOWN_REPOSITORY)
+        payload = event.get("payload") or _EMPTY_DICT
+        _, ref = _strip_ref(payload.get("ref") or _UNKNOWN_REF)
+        ref_type = payload.get("ref_type", _UNKNOWN_REF_TYPE)
         return f"Deleted {ref_type} '{ref}' from '{repo_name}'"
 
-    def _handle_fork_event(self, event: dict) -> str:
+    @staticmethod
+    def _handle_fork_event(event: dict) -> str:
         """Handle ForkEvent type.
 
         Args:
@@ -219,15 +514,17 @@ class GitHubEventHandler:
         Returns:
             str: Formatted string for ForkEvent.
         """
-        repo_name = event.get("repo", {}).get("name", "unknown_repository")
-        forkee = event.get("payload", {}).get("forkee", {}).get("full_name")
+        repo_name = (event.get("repo") or _EMPTY_DICT).get("name", _UNKNOWN_REPOSITORY)
+        payload = event.get("payload") or _EMPTY_DICT
+        forkee = (payload.get("forkee") or _EMPTY_DICT).get("full_name")
 
         if forkee:
             return f"Forked '{repo_name}' to '{forkee}'"
 
         return f"Forked the repository '{repo_name}'"
 
-    def _handle_watch_event(self, event: dict) -> str:
+    @staticmethod
+    def _handle_watch_event(event: dict) -> str:
         """Handle WatchEvent type.
 
         Args:
@@ -236,10 +533,11 @@ class GitHubEventHandler:
         Returns:
             str: Formatted string for WatchEvent.
         """
-        repo_name = event.get("repo", {}).get("name", "unknown_repository")
+        repo_name = (event.get("repo") or _EMPTY_DICT).get("name", _UNKNOWN_REPOSITORY)
         return f"Starred the repository '{repo_name}'"
 
-    def _handle_issues_event(self, event: dict) -> str:
+    @staticmethod
+    def _handle_issues_event(event: dict) -> str:
         """Handle IssuesEvent type.
 
         Args:
@@ -248,38 +546,25 @@ class GitHubEventHandler:
         Returns:
             str: Formatted string for IssuesEvent.
         """
-        repo_name = event.get("repo", {}).get("name", "unknown_repository")
-        payload = event.get("payload", {})
-        action = payload.get("action", "performed an action")
-        issue_number = payload.get("issue", {}).get("number", "unknown_issue")
-        user = event.get("actor", {}).get("login", "unknown_user")
-        assignee_data = payload.get("issue", {}).get("assignee")
-        assignee = (
-            assignee_data.get("login", "unknown_assignee")
-            if assignee_data
-            else "unknown_assignee"
+        repo_name = (event.get("repo") or _EMPTY_DICT).get("name", _UNKNOWN_REPOSITORY)
+        payload = event.get("payload") or _EMPTY_DICT
+        issue = payload.get("issue") or _EMPTY_DICT
+        action = payload.get("action", _UNKNOWN_ACTION)
+        issue_number = issue.get("number", "unknown_issue")
+        user = (event.get("actor") or _EMPTY_DICT).get("login", _UNKNOWN_USER)
+        assignee = (issue.get("assignee") or _EMPTY_DICT).get(
+            "login", "unknown_assignee"
         )
-        labels = payload.get("issue", {}).get("labels", [])
+        labels = issue.get("labels")
         label = labels[0].get("name", "unknown_label") if labels else "unknown_label"
 
-        if action in [
-            "opened",
-            "edited",
-            "deleted",
-            "closed",
-            "reopened",
-            "transferred",
-            "pinned",
-            "unpinned",
-            "locked",
-            "unlocked",
-        ]:
+        if action in ISSUE_STATE_ACTIONS:
             return f"Issue #{issue_number} was {action} by {user} in {repo_name}"
-        if action in ["assigned"]:
+        if action == "assigned":
             return f"Issue #{issue_number} was {action} to {assignee} by {user} in {repo_name}"
         if action == "unassigned":
             return f"Issue #{issue_number} was {action} from {assignee} by {user} in {repo_name}"
-        if action in ["labeled", "unlabeled"]:
+        if action in ISSUE_LABEL_ACTIONS:
             return (
                 f"Issue #{issue_number} was {action} {label} by {user} in {repo_name}"
             )
@@ -287,7 +572,8 @@ class GitHubEventHandler:
             f"Performed an action {action} on issue {issue_number} of repo {repo_name}"
         )
 
-    def _handle_pull_request_event(self, event: dict) -> str:
+    @staticmethod
+    def _handle_pull_request_event(event: dict) -> str:
         """Handle PullRequestEvent type.
 
         Args:
@@ -296,16 +582,32 @@ class GitHubEventHandler:
         Returns:
             str: Formatted string for PullRequestEvent.
         """
-        repo_name = event.get("repo", {}).get("name", "unknown_repository")
-        payload = event.get("payload", {})
-        action = payload.get("action", "performed an action")
+        repo_name = (event.get("repo") or _EMPTY_DICT).get("name", _UNKNOWN_REPOSITORY)
+        payload = event.get("payload") or _EMPTY_DICT
+        pull_request = payload.get("pull_request") or _EMPTY_DICT
+        action = payload.get("action", _UNKNOWN_ACTION)
         pr_number = payload.get("number", "unknown_pr")
-        title = payload.get("pull_request", {}).get("title", "unknown_title")
-        actor = (
-            payload.get("pull_request", {}).get("user", {}).get("login", "unknown_user")
-        )
+        title = pull_request.get("title", "unknown_title")
+        actor = (pull_request.get("user") or _EMPTY_DICT).get("login", _UNKNOWN_USER)
         return f"PR #{pr_number} '{title}' was {action} in {repo_name} by {actor}"
 
+    # Event type -> handler. The handlers are staticmethods, so the table is
+    # built once for the class and shared by all instances.
+    _HANDLERS = {
+        "CreateEvent": _handle_create_event,
+        "PushEvent": _handle_push_event,
+        "DeleteEvent": _handle_delete_event,
+        "ForkEvent": _handle_fork_event,
+        "WatchEvent": _handle_watch_event,
+        "IssuesEvent": _handle_issues_event,
+        "PullRequestEvent": _handle_pull_request_event,
+    }
+    SUPPORTED_EVENTS = frozenset(_HANDLERS)
+
+    def get_supported_events(self) -> frozenset:
+        """Get supported event types."""
+        return self.SUPPORTED_EVENTS
+
     def handle_output(self, event: dict) -> str:
         """Handle output based on event type.
 
@@ -317,57 +619,90 @@ class GitHubEventHandler:
         """
         event_type = event.get("type")
 
-        handler_name = self.HANDLERS.get(event_type)
+        handler = self._HANDLERS.get(event_type)
 
-        if not handler_name:
+        if not handler:
             return f"Unhandled event type: {event_type}"
 
-        handler = getattr(self, handler_name, None)
+        return handler(event)
 
-        if not callable(handler):
-            return f"Handler not implemented for event type: {event_type}"
 
-        return handler(event)
+def _cache_path(user: str) -> Path | None:
+    """Get cache file path for a user.
 
+    Cache files live in $XDG_CACHE_HOME/gh-activity (~/.cache/gh-activity
+    by default), so runs from any directory share them.
 
-class EventsCacheHandler:
-    """Class to handle caching of GitHub events."""
+    Args:
+        user (str): GitHub username.
 
-    @staticmethod
-    def _get_cache_file_name(user: str) -> str:
-        """Get cache file name for a user.
+    Returns:
+        Path | None: Cache file path, or None if the user name is not a
+        valid GitHub login or no cache directory can be determined.
+    """
+    # GitHub logins are ASCII letters, digits and hyphens, so this also keeps
+    # path separators and ".." out of the file name.
+    if not (user.isascii() and user.replace("-", "").isalnum()):
+        return None
 
-        Args:
-            user (str): GitHub username.
+    # Relative XDG_CACHE_HOME values are invalid per the XDG spec and ignored.
+    cache_home = os.getenv("XDG_CACHE_HOME")
+    if not (cache_home and os.path.isabs(cache_home)):
+        try:
+            cache_home = Path.home() / ".cache"
+        except (RuntimeError, KeyError) as e:
+            logging.warning("Cannot locate cache directory, caching disabled: %s", e)
+            return None
+    cache_home = Path(cache_home)
+    if not cache_home.is_absolute():
+        # Home directory could not be determined ("~" left unexpanded).
+        logging.warning("Cannot locate cache directory, caching disabled")
+        return None
+    return cache_home / CACHE_DIR_NAME / f"{user}.json"
 
-        Returns:
-            str: Cache file name.
-        """
-        return f".events_cache_{user}.json"
+
+class EventsCacheHandler:
+    """Class to handle caching of GitHub events."""
 
     def write_cache(self, user: str, cache: dict):
         """Writing events to cache file.
 
+        The file is written to a temporary name first and then renamed over
+        the cache file, so readers never see a partially written cache.
+
         Args:
             user (str): GitHub username.
+            cache (dict): Cache entry to store.
         """
-        cache_file = self._get_cache_file_name(user)
+        cache_file = _cache_path(user)
+        if cache_file is None:
+            return
+        temp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
         try:
-            with open(cache_file, "w", encoding="utf-8") as file:
-                json.dump(cache, file, indent=4)
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, "wb") as file:
+                file.write(_json_dumps(cache))
+            os.replace(temp_file, cache_file)
         except OSError as e:
             logging.warning("Failed to write cache file: %s", e)
+            temp_file.unlink(missing_ok=True)
 
-    def _is_cache_expired(self, cached_at: str, ttl_seconds: int) -> bool:
+    def _is_cache_expired(self, cached_at: float | str, ttl_seconds: int) -> bool:
         """Check if the cache is expired based on TTL.
 
         Args:
-            cached_at (str): Timestamp when the cache was created.
+            cached_at (float | str): Epoch seconds or ISO 8601 timestamp
+                when the cache was created.
             ttl_seconds (int): Time-to-live in seconds.
 
         Returns:
             bool: True if cache is expired, False otherwise.
         """
+        if isinstance(cached_at, (int, float)):
+            return time.time() - cached_at > ttl_seconds
+
+        # Cache files written before "fetched_at" was added only carry the
+        # ISO timestamp.
         try:
             cached_time = datetime.fromisoformat(cached_at.replace("Z", "+00:00"))
         except (ValueError, AttributeError):
@@ -376,97 +711,106 @@ class EventsCacheHandler:
         now = datetime.now(timezone.utc)
         return (now - cached_time).total_seconds() > ttl_seconds
 
-    def check_cache_usability(self, user: str) -> list | None:
+    def check_cache_usability(self, user: str) -> tuple[list | None, str | None]:
         """Check if cache is usable and return cached events if valid.
 
+        Expired events are still returned when the cache holds their ETag,
+        so they can be revalidated with a conditional request.
+
         Args:
             user (str): GitHub username.
 
         Returns:
-            list | None: Cached events if valid, None otherwise.
+            tuple[list | None, str | None]: Cached events and, if they are
+            expired, their ETag. (None, None) if there is no usable cache.
         """
-        cache_file = self._get_cache_file_name(user)
-        if not Path(cache_file).is_file():
-            return None
+        cache_file = _cache_path(user)
+        if cache_file is None or not cache_file.is_file():
+            return None, None
 
         try:
-            with open(cache_file, "r", encoding="utf-8") as file:
-                cached_data = json.load(file)
+            with open(cache_file, "rb") as file:
+                cached_data = _json_loads(file.read())
         except (OSError, json.JSONDecodeError) as e:
             logging.warning("Failed to read cache file: %s", e)
-            return None
+            return None, None
 
-        timestamp = cached_data.get("timestamp")
+        cached_at = cached_data.get("fetched_at", cached_data.get("timestamp"))
         ttl = cached_data.get("ttl", CACHE_TTL_SECONDS)
+        etag = cached_data.get("etag")
         events = cached_data.get("events", [])
 
         if not isinstance(events, list):
             logging.warning("Invalid cache format, ignoring cache")
-            return None
+            return None, None
 
-        if timestamp and not self._is_cache_expired(timestamp, ttl):
-            return events
+        _intern_event_fields(events)
 
-        return None
+        if cached_at and not self._is_cache_expired(cached_at, ttl):
+            return events, None
 
+        if etag:
+            return events, etag
 
-class CLIHandler:
-    """Class to handle cli arguments and displaying output."""
+        return None, None
 
-    @staticmethod
-    def parse_mandatory_cli_args() -> tuple[str | None, int | None]:
-        """parse cli arguments.
 
-        Returns:
-            tuple[str, int] | None: github username and number of events
-        """
-        if len(sys.argv) < MIN_CLI_ARGS_COUNT:
+def parse_cli_args(
+    supported_events: frozenset,
+) -> tuple[str | None, int | None, str | None]:
+    """parse cli arguments.
+
+    Args:
+        supported_events (frozenset): Event types that can be used as filter.
+
+    Returns:
+        tuple[str | None, int | None, str | None]: github username, number of
+        events and event type filter. Username and number of events are None
+        if the arguments are invalid; the filter is None if not given or not
+        supported.
+    """
+    match sys.argv:
+        case [_, github_username, number_arg]:
+            event_type = None
+        case [_, github_username, number_arg, event_type]:
+            pass
+        case _:
             print(
                 "Usage: python github_user_activity.py <github-username> <number of events> [event-type(optional)]"
             )
-            return None, None
+            return None, None, None
 
-        github_username = sys.argv[1]
+    try:
+        number_of_events = int(number_arg)
+    except ValueError:
+        logging.error("Please enter a valid integer for number of events.")
+        return None, None, None
 
-        try:
-            number_of_events = int(sys.argv[2])
-            if number_of_events <= 0:
-                logging.error("Number of events must be greater than zero")
-                return None, None
-
-            if number_of_events > GITHUB_DEFAULT_EVENTS_PER_PAGE:
-                logging.error(
-                    "Number of events cannot exceed %s", GITHUB_DEFAULT_EVENTS_PER_PAGE
-                )
-                return None, None
-
-        except ValueError:
-            logging.error("Please enter a valid integer for number of events.")
-            return None, None
-
-        return github_username, number_of_events
+    if number_of_events <= 0:
+        logging.error("Number of events must be greater than zero")
+        return None, None, None
 
-    @staticmethod
-    def parse_optional_cli_args(supported_events: set) -> str | None:
-        """Parse optional cli arguments.
-
-        Returns:
-            str: event type if specified and valid, None otherwise.
-        """
-        if len(sys.argv) == CLI_ARGS_COUNT_WITH_FILTER:
-            if sys.argv[3] in supported_events:
-                return sys.argv[3]
+    if number_of_events > GITHUB_DEFAULT_EVENTS_PER_PAGE:
+        logging.error(
+            "Number of events cannot exceed %s", GITHUB_DEFAULT_EVENTS_PER_PAGE
+        )
+        return None, None, None
 
-            print("Invalid event type specified.")
-            print("Supporting event types are: ", supported_events)
+    if event_type is not None and event_type not in supported_events:
+        print("Invalid event type specified.")
+        print("Supporting event types are:", ", ".join(sorted(supported_events)))
+        event_type = None
 
-        return None
+    return github_username, number_of_events, event_type
 
 
 def main():
     """Main function to run the CLI application."""
 
-    github_username, number_of_events = CLIHandler.parse_mandatory_cli_args()
+    github_event_handler = GitHubEventHandler()
+    github_username, number_of_events, requested_event_type = parse_cli_args(
+        github_event_handler.get_supported_events()
+    )
 
     if not github_username or not number_of_events:
         return
@@ -474,38 +818,42 @@ def main():
     events_cache_handler = EventsCacheHandler()
     github_api_client = GitHubAPIClient(github_username)
 
-    events = events_cache_handler.check_cache_usability(github_username)
+    events, etag = events_cache_handler.check_cache_usability(github_username)
 
-    if not events:
-        events = github_api_client.fetch_activity()
+    # An ETag is only returned alongside expired events that need revalidating.
+    if not events or etag:
+        events = github_api_client.fetch_activity(events, etag)
+        github_api_client.close()
         if events:
             cache = {
-                "timestamp": github_api_client.timestamp,
+                "timestamp": _format_timestamp(github_api_client.fetched_at),
+                "fetched_at": github_api_client.fetched_at,
                 "ttl": CACHE_TTL_SECONDS,
+                "etag": github_api_client.etag,
                 "events": events,
             }
             events_cache_handler.write_cache(github_username, cache)
 
     if events:
-        github_event_handler = GitHubEventHandler()
-        supported_events = github_event_handler.get_supported_events()
-        requested_event_type = CLIHandler.parse_optional_cli_args(supported_events)
-
-        print("-" * OUTPUT_SEPARATOR_WIDTH)
-        display_strings = []
-        for event in events:
-            if requested_event_type and event.get("type") != requested_event_type:
-                continue
-            display_strings.append(github_event_handler.handle_output(event))
-            if len(display_strings) == number_of_events:
-                break
+        selected_events = events
+        if requested_event_type:
+            selected_events = (
+                event
+                for event in selected_events
+                if event.get("type") == requested_event_type
+            )
+        display_strings = [
+            github_event_handler.handle_output(event)
+            for event in islice(selected_events, number_of_events)
+        ]
 
-        if display_strings:
-            for display_string in display_strings:
-                print(display_string)
-        else:
-            print("No events to display.")
-        print("-" * OUTPUT_SEPARATOR_WIDTH)
+        if not display_strings:
+            display_strings = ["No events to display."]
+
+        # Emit the whole block with a single write instead of one print per line.
+        sys.stdout.write(
+            "\n".join([OUTPUT_SEPARATOR, *display_strings, OUTPUT_SEPARATOR]) + "\n"
+        )
 
 
 if __name__ == "__main__":
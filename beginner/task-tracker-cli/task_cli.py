@@ -1,9 +1,8 @@
 """To track task via command line interface."""
 
+import os
 import sys
 import json
-from pathlib import Path
-from datetime import datetime
 
 ADD_COMMAND_LENGTH = 3
 DELETE_COMMAND_LENGTH = 3
@@ -11,12 +10,35 @@ UPDATE_COMMAND_LENGTH = 4
 MARK_STATUS_COMMAND_LENGTH = 3
 LIST_WITHOUT_ARGUMENT_LENGTH = 2
 LIST_WITH_ARGUMENT_LENGTH = 3
+BATCH_FROM_STDIN_LENGTH = 2
+BATCH_FROM_FILE_LENGTH = 3
 TASK_FILE = "task_list.json"
+SEPARATOR = "-" * 40
+USAGE = "Usage: python task_cli.py [add|delete|update|mark-in-progress|mark-done|mark-todo|list|batch] <args>"
+VALID_STATUSES = frozenset({"todo", "in-progress", "done"})
+MARK_COMMAND_STATUSES = {"mark-in-progress": "in-progress", "mark-done": "done", "mark-todo": "todo"}
 
 class TaskManager:
     """Handling of task list operations."""
     def __init__(self, tasks: list):
+        if not isinstance(tasks, list):
+            raise TypeError("Invalid tasks data structure")
+
         self.tasks = tasks
+        # Set only when a task actually changes, so no-op commands skip the save.
+        self.modified = False
+        # Index of tasks by ID and the next free ID. Both are built on first
+        # use, so commands that never look up or add a task don't pay for
+        # them, and hand-edited IDs can't break read-only commands.
+        self._by_id = None
+        self._next_id = None
+        # A single command touches at most one task, so the timestamp is
+        # formatted once on first use and reused until reset_current_time.
+        self._current_time = None
+
+    def reset_current_time(self):
+        """Forget the cached timestamp so the next change stamps a fresh one."""
+        self._current_time = None
 
     def _fetch_current_time(self) -> str:
         """To fetch current time and format into human readable string.
@@ -28,8 +50,33 @@ class TaskManager:
             str: Current date and time in "DD-MM-YYYY HH:MM:SS" format.
         """
 
-        current_datetime = datetime.now()
-        return current_datetime.strftime("%d-%m-%Y %H:%M:%S")
+        if self._current_time is None:
+            # Imported here so commands that never stamp a task skip it.
+            from datetime import datetime
+
+            # Fixed format, so plain integer formatting instead of strftime.
+            now = datetime.now()
+            self._current_time = (
+                f"{now.day:02d}-{now.month:02d}-{now.year:04d} "
+                f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}")
+        return self._current_time
+
+    def _find_item(self, id:int) -> dict | None:
+        """Find task by ID, indexing the task list on first call.
+
+        Args:
+            id (int): ID of the task to be found.
+
+        Returns:
+            dict | None: First task with the ID, None if there is none.
+        """
+        if self._by_id is None:
+            self._by_id = {}
+            for item in self.tasks:
+                item_id = item.get("id")
+                if isinstance(item_id, int):
+                    self._by_id.setdefault(item_id, item)
+        return self._by_id.get(id)
 
     def mark_status(self, id:int, status:str) -> bool:
         """Mark status of existing item.
@@ -42,12 +89,16 @@ class TaskManager:
             bool: True if task is found and updated, False otherwise.
         """
 
-        for item in self.tasks:
-            if item["id"] == id:
-                item["status"] = status
-                item["updatedAt"] = self._fetch_current_time()
-                return True
-        return False
+        item = self._find_item(id)
+        if item is None:
+            return False
+        if item.get("status") == status:
+            return True
+
+        item["status"] = status
+        item["updatedAt"] = self._fetch_current_time()
+        self.modified = True
+        return True
 
     def update_item(self, id:int, description:str) -> bool:
         """Update the existing item decription.
@@ -60,12 +111,16 @@ class TaskManager:
             bool: True if task is found and updated, False otherwise.
         """
         
-        for item in self.tasks:
-            if item["id"] == id:
-                item["description"] = description
-                item["updatedAt"] = self._fetch_current_time()
-                return True
-        return False
+        item = self._find_item(id)
+        if item is None:
+            return False
+        if item.get("description") == description:
+            return True
+
+        item["description"] = description
+        item["updatedAt"] = self._fetch_current_time()
+        self.modified = True
+        return True
 
     def delete_item(self, id:int) -> bool:
         """Delete task from task list.
@@ -77,11 +132,14 @@ class TaskManager:
             bool: True if task is found and deleted, False otherwise.
         """
 
-        for index, item in enumerate(self.tasks):
-            if item["id"] == id:
-                del self.tasks[index]
-                return True
-        return False
+        item = self._find_item(id)
+        if item is None:
+            return False
+
+        del self._by_id[id]
+        self.tasks.remove(item)
+        self.modified = True
+        return True
 
     def add_item(self, description:str) -> bool:
         """Add new task to the task list.
@@ -92,39 +150,44 @@ class TaskManager:
         Returns:
             bool: True if task is added successfully, False otherwise.
         """
-        if not isinstance(self.tasks, list):
-            raise TypeError("Invalid tasks data structure")
-
-        if len(self.tasks) > 0:
-            id = max(item["id"] for item in self.tasks) + 1
-        else:
-            id = 1
+        if self._next_id is None:
+            # IDs that aren't integers (hand-edited files) are skipped.
+            task_ids = (item.get("id") for item in self.tasks)
+            self._next_id = max((task_id for task_id in task_ids if isinstance(task_id, int)), default=0) + 1
+        id = self._next_id
+        self._next_id += 1
         
         current_datetime = self._fetch_current_time()
 
-        self.tasks.append({
+        item = {
             "id": id, 
             "description": description, 
             "status": "todo", 
             "createdAt": current_datetime, 
-            "updatedAt": current_datetime})
+            "updatedAt": current_datetime}
+        self.tasks.append(item)
+        if self._by_id is not None:
+            self._by_id[id] = item
+        self.modified = True
         
         return True
 
-    def print_item(self, task_item: dict):
-        """Printing task item.
+    def format_item(self, task_item: dict) -> str:
+        """Format task item for printing.
+
         Args:
-            task_item (dict): Task item to be printed.
+            task_item (dict): Task item to be formatted.
 
         Returns:
-            None
+            str: Task fields, one per line, followed by a separator line.
         """
-        print(f"ID : {task_item['id']}")
-        print(f"Description : {task_item['description']}")
-        print(f"Status : {task_item['status']}")
-        print(f"Created At : {task_item['createdAt']}")
-        print(f"Updated At : {task_item['updatedAt']}")
-        print("-" * 40)
+        return (
+            f"ID : {task_item['id']}\n"
+            f"Description : {task_item['description']}\n"
+            f"Status : {task_item['status']}\n"
+            f"Created At : {task_item['createdAt']}\n"
+            f"Updated At : {task_item['updatedAt']}\n"
+            f"{SEPARATOR}\n")
 
 
 class CommandHandler:
@@ -132,43 +195,76 @@ class CommandHandler:
     def __init__(self, task_manager:TaskManager):
         self.task_manager = task_manager
 
-    def handle_add_command(self) -> bool:
+    @staticmethod
+    def print_unknown_command(command: str):
+        """Printing the error for an unknown command.
+        
+        Args:
+            command (str): Command name that was not recognised.
+        """
+        print(f"Error: Unknown command {command}")
+        print(USAGE)
+
+    def dispatch(self, argv: list) -> bool:
+        """Run the command named in argv[1].
+        
+        Args:
+            argv (list): Command line arguments.
+
+        Returns:
+            bool: True if the command succeeded, False otherwise.
+        """
+        handler = self.COMMANDS.get(argv[1])
+        if not handler:
+            self.print_unknown_command(argv[1])
+            return False
+
+        return handler(self, argv)
+
+    def handle_add_command(self, argv: list) -> bool:
         """Handling add task item.
         
+        Args:
+            argv (list): Command line arguments.
+
         Returns:
             bool: True if task is added successfully, False otherwise.
         """
         try:
-            if len(sys.argv) != ADD_COMMAND_LENGTH or sys.argv[2] == "":
+            if len(argv) != ADD_COMMAND_LENGTH or argv[2] == "":
                 print("Error: 'add' requires exactly 1 argument and cannot be empty string.")
                 print("Usage: python task_cli.py add <description>")
                 return False
 
-            addition_status = self.task_manager.add_item(str(sys.argv[2]))
+            addition_status = self.task_manager.add_item(str(argv[2]))
             if addition_status:
-                print(f" Task '{sys.argv[2]}' is added successfully")
+                print(f" Task '{argv[2]}' is added successfully")
             return addition_status
         except IndexError:
             print("Error: Missing arguments or command.\nUsage: python task_cli.py add <description>")
             return False
 
-    def handle_del_command(self) -> bool:
+    def handle_del_command(self, argv: list) -> bool:
         """Handling delete task item.
         
+        Args:
+            argv (list): Command line arguments.
+
         Returns:
             bool: True if task is deleted successfully, False otherwise.
         """
         try:
-            if len(sys.argv) != DELETE_COMMAND_LENGTH:
+            if len(argv) != DELETE_COMMAND_LENGTH:
                 print("Error: 'delete' requires exactly 1 argument.")
                 print("Usage: python task_cli.py delete <id>")
                 return False
 
-            deletion_status = self.task_manager.delete_item(int(sys.argv[2]))
+            task_id = int(argv[2])
+            deletion_status = self.task_manager.delete_item(task_id)
             if not deletion_status:
-                print(f"Error: Task with ID {sys.argv[2]} not found.")
+                print(f"Error: Task with ID {task_id} not found.")
             else:
-                print(f"Task with ID: {sys.argv[2]} deleted successfully.")
+                print(f"Task with ID: {task_id} deleted successfully.")
             return deletion_status
         except IndexError:
             print("Error: Missing arguments or command.\nUsage: python task_cli.py delete <id>")
@@ -177,24 +273,28 @@ class CommandHandler:
             print("Error: Invalid ID format. ID should be an integer.")
             return False
 
-    def handle_update_command(self) -> bool:
+    def handle_update_command(self, argv: list) -> bool:
         """Handling update task item.
         
+        Args:
+            argv (list): Command line arguments.
+
         Returns:
             bool: True if task is updated successfully, False otherwise.
         """
         try:
-            if len(sys.argv) != UPDATE_COMMAND_LENGTH:
+            if len(argv) != UPDATE_COMMAND_LENGTH:
                 print("Error: 'update' requires exactly 2 arguments.")
                 print("Usage: python task_cli.py update <id> <description>")
                 return False
 
-            if sys.argv[3] != "":
-                updation_status = self.task_manager.update_item(int(sys.argv[2]), sys.argv[3])
+            if argv[3] != "":
+                task_id = int(argv[2])
+                updation_status = self.task_manager.update_item(task_id, argv[3])
                 if not updation_status:
-                    print(f"Error: Task with ID: {sys.argv[2]} not found.")
+                    print(f"Error: Task with ID: {task_id} not found.")
                 else:
-                    print(f"Task with ID: {sys.argv[2]} updated successfully")
+                    print(f"Task with ID: {task_id} updated successfully")
                 return updation_status
 
             print("Error: Description cannot be an empty string.")
@@ -206,109 +306,72 @@ class CommandHandler:
             print("Error: Invalid ID format. ID should be an integer.")
             return False
 
-    def handle_mark_in_progress_command(self) -> bool:
-        """Handling mark-in-progress task item.
+    def handle_mark_command(self, argv: list) -> bool:
+        """Handling mark-in-progress, mark-done and mark-todo task item.
         
-        Returns:
-            bool: True if task is marked successfully, False otherwise.
-        """
-        try:
-            if len(sys.argv) != MARK_STATUS_COMMAND_LENGTH:
-                print("Error: 'mark-in-progress' requires exactly 1 argument.")
-                print("Usage: python task_cli.py mark-in-progress <id>")
-                return False
-
-            mark_status = self.task_manager.mark_status(int(sys.argv[2]), "in-progress")
-            if not mark_status:
-                print(f"Error: Task with ID: {sys.argv[2]} not found.")
-            else:
-                print(f"Task with ID: {sys.argv[2]} marked as in-progress successfully.")
-            return mark_status
-        except IndexError:
-            print("Error: Missing arguments or command.\nUsage: python task_cli.py mark-in-progress <id>")
-            return False
-        except ValueError:
-            print("Error: Invalid ID format. ID should be an integer.")
-            return False
+        Args:
+            argv (list): Command line arguments.
 
-    def handle_mark_done_command(self) -> bool:
-        """Handling mark-done task item.
-        
         Returns:
             bool: True if task is marked successfully, False otherwise.
         """
+        command = argv[1]
+        status = MARK_COMMAND_STATUSES[command]
         try:
-            if len(sys.argv) != MARK_STATUS_COMMAND_LENGTH:
-                print("Error: 'mark-done' requires exactly 1 argument.")
-                print("Usage: python task_cli.py mark-done <id>")
+            if len(argv) != MARK_STATUS_COMMAND_LENGTH:
+                print(f"Error: '{command}' requires exactly 1 argument.")
+                print(f"Usage: python task_cli.py {command} <id>")
                 return False
 
-            mark_status = self.task_manager.mark_status(int(sys.argv[2]), "done")
+            task_id = int(argv[2])
+            mark_status = self.task_manager.mark_status(task_id, status)
             if not mark_status:
-                print(f"Error: Task with ID: {sys.argv[2]} not found.")
+                print(f"Error: Task with ID: {task_id} not found.")
             else:
-                print(f"Task with ID: {sys.argv[2]} marked as done successfully.")
+                print(f"Task with ID: {task_id} marked as {status} successfully.")
             return mark_status
         except IndexError:
-            print("Error: Missing arguments or command.\nUsage: python task_cli.py mark-done <id>")
+            print(f"Error: Missing arguments or command.\nUsage: python task_cli.py {command} <id>")
             return False
         except ValueError:
             print("Error: Invalid ID format. ID should be an integer.")
             return False
 
-    def handle_mark_todo_command(self) -> bool:
-        """Handling mark-todo task item.
+    def _print_items(self, tasks: list):
+        """Print task items with a single write.
         
-        Returns:
-            bool: True if task is marked successfully, False otherwise.
+        Args:
+            tasks (list): Task items to be printed.
         """
-        try:
-            if len(sys.argv) != MARK_STATUS_COMMAND_LENGTH:
-                print("Error: 'mark-todo' requires exactly 1 argument.")
-                print("Usage: python task_cli.py mark-todo <id>")
-                return False
-
-            mark_status = self.task_manager.mark_status(int(sys.argv[2]), "todo")
-            if not mark_status:
-                print(f"Error: Task with ID: {sys.argv[2]} not found.")
-            else:
-                print(f"Task with ID: {sys.argv[2]} marked as todo successfully.")
-            return mark_status
-        except IndexError:
-            print("Error: Missing arguments or command.\nUsage: python task_cli.py mark-todo <id>")
-            return False
-        except ValueError:
-            print("Error: Invalid ID format. ID should be an integer.")
-            return False
+        sys.stdout.write("".join(map(self.task_manager.format_item, tasks)))
 
-    def handle_list_command(self) -> bool:
+    def handle_list_command(self, argv: list) -> bool:
         """Handling list task items.
         
+        Args:
+            argv (list): Command line arguments.
+
         Returns:
             bool: True if tasks are listed successfully, False otherwise.
         """
         try:
-            found_any_task = False
-            if len(sys.argv) == LIST_WITHOUT_ARGUMENT_LENGTH:
-                for item in self.task_manager.tasks:
-                    self.task_manager.print_item(item)
-                    found_any_task = True
-                if not found_any_task:
+            if len(argv) == LIST_WITHOUT_ARGUMENT_LENGTH:
+                if not self.task_manager.tasks:
                     print("No tasks found.")
                     return False
+                self._print_items(self.task_manager.tasks)
                 return True
-            if len(sys.argv) == LIST_WITH_ARGUMENT_LENGTH:
-                if sys.argv[2] in ["todo", "in-progress", "done"]:
-                    for item in self.task_manager.tasks:
-                        if item["status"] == str(sys.argv[2]):
-                            self.task_manager.print_item(item)
-                            found_any_task = True
-                    if not found_any_task:
-                        print(f"No tasks found with status {sys.argv[2]}")
+            if len(argv) == LIST_WITH_ARGUMENT_LENGTH:
+                status = argv[2]
+                if status in VALID_STATUSES:
+                    matching_tasks = [item for item in self.task_manager.tasks if item.get("status") == status]
+                    if not matching_tasks:
+                        print(f"No tasks found with status {status}")
                         return False
+                    self._print_items(matching_tasks)
                     return True
 
-                print(f"Error: Unknown status '{sys.argv[2]}' list requested")
+                print(f"Error: Unknown status '{argv[2]}' list requested")
                 print("Usage: python task_cli.py list [todo|in-progress|done]")
                 return False
 
@@ -319,18 +382,100 @@ class CommandHandler:
             print("Error: Missing arguments or command.\nUsage: python task_cli.py list [todo|in-progress|done]")
             return False
 
+    def handle_batch_command(self, argv: list) -> bool:
+        """Handling a batch of commands, one per line, from a file or stdin.
+
+        Lines are split like shell arguments; blank lines and lines starting
+        with '#' are skipped. The batch stops at the first line that fails,
+        and then none of its changes are saved; otherwise the task file is
+        written once after the batch.
+        
+        Args:
+            argv (list): Command line arguments.
+
+        Returns:
+            bool: True if every command in the batch succeeded, False otherwise.
+        """
+        import shlex
+
+        if len(argv) == BATCH_FROM_STDIN_LENGTH:
+            if sys.stdin.isatty():
+                print("Error: batch without a file reads commands from piped input.")
+                print("Usage: python task_cli.py batch [file]")
+                return False
+            lines = sys.stdin.readlines()
+        elif len(argv) == BATCH_FROM_FILE_LENGTH:
+            try:
+                with open(argv[2], "r", encoding="utf-8") as file:
+                    lines = file.readlines()
+            except OSError as error:
+                print(f"Error: Cannot read batch file {argv[2]}: {error.strerror}")
+                return False
+        else:
+            print("Error: batch takes 0 or 1 argument.")
+            print("Usage: python task_cli.py batch [file]")
+            return False
+
+        for line_number, line in enumerate(lines, start=1):
+            try:
+                args = shlex.split(line, comments=True)
+            except ValueError as error:
+                print(f"Error: line {line_number}: {error}")
+                args = None
+            if args == []:
+                continue
+            if args and args[0] == "batch":
+                print(f"Error: line {line_number}: batch cannot be nested.")
+                args = None
+            # Each command in the batch gets its own timestamp.
+            self.task_manager.reset_current_time()
+            if args is None or not self.dispatch([argv[0], *args]):
+                print(f"Batch stopped at line {line_number}, no changes were saved.")
+                return False
+        return True
+
+    # Command name -> handler, built once for the class. Also lets __main__
+    # reject unknown commands before reading the task file.
+    COMMANDS = {
+        "add": handle_add_command,
+        "delete": handle_del_command,
+        "update": handle_update_command,
+        "mark-in-progress": handle_mark_command,
+        "mark-done": handle_mark_command,
+        "mark-todo": handle_mark_command,
+        "list": handle_list_command,
+        "batch": handle_batch_command}
+
 class JSONHandler:
-    """Handles reading and writing tasks to JSON file."""
+    """Handles reading and writing tasks to JSON file.
+
+    Used as a context manager, the tasks are read once on entry and written
+    once on exit if dirty was set, however many commands changed them.
+    """
+    def __init__(self):
+        self.tasks = []
+        self.dirty = False
+
+    def __enter__(self) -> list:
+        self.tasks = self.read_tasks_from_json()
+        self.dirty = False
+        return self.tasks
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None and self.dirty:
+            self.write_tasks_to_json(self.tasks)
+
     def read_tasks_from_json(self) -> list:
         """Read tasks from JSON file.
         
         Returns:
             list: list of tasks from JSON if available, else empty list 
         """
-        if Path(TASK_FILE).exists():
+        if os.path.exists(TASK_FILE):
             try:
-                with open(TASK_FILE, "r", encoding="utf-8") as file:
-                    tasks_list = json.load(file)
+                # One read of the raw bytes; json.loads detects the UTF encoding.
+                with open(TASK_FILE, "rb") as file:
+                    tasks_list = json.loads(file.read())
                 if tasks_list is None:
                     return []
                 return tasks_list
@@ -338,54 +483,64 @@ class JSONHandler:
                 print(f"Invalid JSON exist. Overwriting {TASK_FILE} with empty task list.")
                 return []
         else:
+            # The empty list is a constant document, no need to encode it.
             with open(TASK_FILE, "w", encoding="utf-8") as file:
-                json.dump([], file, indent=4)
+                file.write("[]")
             return []
   
     def write_tasks_to_json(self, tasks_list: list):
         """Write tasks to JSON file.
+
+        The tasks are written to a temporary file that is then renamed over
+        TASK_FILE, so an interrupted write never leaves a truncated task list.
+        A symlinked TASK_FILE is followed, so the link itself is kept.
         
         Args:
             tasks (list): List of tasks to be written to JSON file.
         """
-        with open(TASK_FILE,"w", encoding="utf-8") as file:
-            json.dump(tasks_list, file, indent=4)
+        # json.dump writes every encoder chunk separately; encoding once and
+        # writing the whole document is a single write call.
+        data = json.dumps(tasks_list, indent=4).encode("utf-8")
+        task_file = os.path.realpath(TASK_FILE)
+        temp_file = f"{task_file}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file, "wb") as file:
+                file.write(data)
+            # Keep the permissions and, where allowed, the ownership of the
+            # existing task file.
+            if os.path.exists(task_file):
+                task_file_stat = os.stat(task_file)
+                os.chmod(temp_file, task_file_stat.st_mode & 0o7777)
+                try:
+                    os.chown(temp_file, task_file_stat.st_uid, task_file_stat.st_gid)
+                except (AttributeError, PermissionError):
+                    pass
+            os.replace(temp_file, task_file)
+        except OSError:
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+            raise
 
 if __name__ == "__main__":
 
     json_handler = JSONHandler()
 
-    tasks = json_handler.read_tasks_from_json()
-
-    task_manager = TaskManager(tasks)
-    command_handler = CommandHandler(task_manager)
-
     try:
         command = sys.argv[1]
-        operation_success = False
-
-        if command == "add":
-            operation_success = command_handler.handle_add_command()
-        elif command == "delete":
-            operation_success = command_handler.handle_del_command()
-        elif command == "update":
-            operation_success = command_handler.handle_update_command()           
-        elif command == "mark-in-progress":
-            operation_success = command_handler.handle_mark_in_progress_command()
-        elif command == "mark-done":
-            operation_success = command_handler.handle_mark_done_command()
-        elif command == "mark-todo":
-            operation_success = command_handler.handle_mark_todo_command()
-        elif command == "list":
-            operation_success = command_handler.handle_list_command()
-        else:
-            print(f"Error: Unknown command {command}")
-            print("Usage: python task_cli.py [add|delete|update|mark-in-progress|mark-done|mark-todo|list] <args>")
-
 
-        if command in ["add", "delete", "update", "mark-in-progress", "mark-done", "mark-todo"] and operation_success:
-            json_handler.write_tasks_to_json(task_manager.tasks)
+        # The task file is only read for commands that exist.
+        if command in CommandHandler.COMMANDS:
+            with json_handler as tasks:
+                task_manager = TaskManager(tasks)
+                command_handler = CommandHandler(task_manager)
+                operation_success = command_handler.dispatch(sys.argv)
+                # A failed batch is discarded as a whole.
+                json_handler.dirty = task_manager.modified and operation_success
+            if command == "batch" and not operation_success:
+                sys.exit(1)
+        else:
+            CommandHandler.print_unknown_command(command)
 
     except IndexError:
         print("Error: Missing arguments or command.")
-        print("Usage: python task_cli.py [add|delete|update|mark-in-progress|mark-done|list] <args>")
+        print(USAGE)